@@ -0,0 +1,99 @@
+"""
+depth チャンネルの板情報を NumPy 配列（価格・数量の SoA）で保持するオーダーブック
+
+SNAPSHOT で板全体を置き換え、CHANGED で価格レベルごとに更新（数量 0 は削除）する。
+最良気配は配列の先頭を参照するだけで取得できる。
+numpy が必要（EdgeXAPIClient(depth_book=True) の場合のみ import される）。
+"""
+import numpy as np
+
+
+class _BookSide:
+    """ 片側の板。key（asks は価格、bids は -価格）の昇順に並べ、先頭が最良気配 """
+
+    def __init__(self, descending: bool, capacity: int):
+        self._sign = -1.0 if descending else 1.0
+        self._capacity = capacity
+        self._key = np.empty(capacity, dtype=np.float64)
+        self._size = np.empty(capacity, dtype=np.float64)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._key[:self._n] * self._sign
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return self._size[:self._n]
+
+    def top(self):
+        """ 最良気配の (価格, 数量)。板が空なら None """
+        if self._n == 0:
+            return None
+        return float(self._key[0] * self._sign), float(self._size[0])
+
+    def replace(self, levels):
+        """ [{"price": str, "size": str}, ...] で板全体を置き換える（同じ価格が複数あれば最後のレベルを使う） """
+        count = len(levels)
+        keys = np.fromiter((float(level["price"]) for level in levels), dtype=np.float64, count=count) * self._sign
+        sizes = np.fromiter((float(level["size"]) for level in levels), dtype=np.float64, count=count)
+        # 逆順で np.unique を取ると、各価格の最後の出現位置が得られる（戻り値の keys は昇順）
+        keys, last = np.unique(keys[::-1], return_index=True)
+        sizes = sizes[count - 1 - last]
+        keep = sizes > 0
+        keys, sizes = keys[keep][:self._capacity], sizes[keep][:self._capacity]
+        self._n = len(keys)
+        self._key[:self._n] = keys
+        self._size[:self._n] = sizes
+
+    def update(self, price: float, size: float):
+        """ 1 価格レベルを更新（size=0 なら削除）。上限を超えた分は最も遠いレベルから捨てる """
+        key = price * self._sign
+        n = self._n
+        i = int(np.searchsorted(self._key[:n], key))
+        if i < n and self._key[i] == key:
+            if size > 0:
+                self._size[i] = size
+            else:
+                self._key[i:n - 1] = self._key[i + 1:n]
+                self._size[i:n - 1] = self._size[i + 1:n]
+                self._n = n - 1
+            return
+        if size <= 0 or i >= self._capacity:
+            return
+        end = min(n, self._capacity - 1)
+        self._key[i + 1:end + 1] = self._key[i:end]
+        self._size[i + 1:end + 1] = self._size[i:end]
+        self._key[i] = key
+        self._size[i] = size
+        self._n = end + 1
+
+
+class DepthBook:
+    """ 1 契約分のオーダーブック """
+
+    def __init__(self, capacity: int = 200):
+        self.bids = _BookSide(descending=True, capacity=capacity)
+        self.asks = _BookSide(descending=False, capacity=capacity)
+
+    def apply(self, depth):
+        """ depth チャンネルの content.data の 1 要素を反映 """
+        bids = depth.get("bids") or []
+        asks = depth.get("asks") or []
+        if str(depth.get("depthType", "")).upper() == "SNAPSHOT":
+            self.bids.replace(bids)
+            self.asks.replace(asks)
+            return
+        for level in bids:
+            self.bids.update(float(level["price"]), float(level["size"]))
+        for level in asks:
+            self.asks.update(float(level["price"]), float(level["size"]))
+
+    def top_bid(self):
+        return self.bids.top()
+
+    def top_ask(self):
+        return self.asks.top()
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from edgex.depth_book import DepthBook  # noqa: E402
+
+
+def levels(*pairs):
+    return [{"price": str(price), "size": str(size)} for price, size in pairs]
+
+
+def snapshot(book, bids=(), asks=()):
+    book.apply({"depthType": "SNAPSHOT", "bids": levels(*bids), "asks": levels(*asks)})
+
+
+def changed(book, bids=(), asks=()):
+    book.apply({"depthType": "CHANGED", "bids": levels(*bids), "asks": levels(*asks)})
+
+
+def test_snapshot_orders_bids_descending_and_asks_ascending():
+    book = DepthBook()
+    snapshot(book, bids=[(9, 1), (11, 2), (10, 3)], asks=[(13, 1), (12, 2), (14, 3)])
+    assert book.bids.prices.tolist() == [11, 10, 9]
+    assert book.bids.sizes.tolist() == [2, 3, 1]
+    assert book.asks.prices.tolist() == [12, 13, 14]
+    assert book.top_bid() == (11.0, 2.0)
+    assert book.top_ask() == (12.0, 2.0)
+
+
+def test_snapshot_replaces_whole_book_and_skips_zero_sizes():
+    book = DepthBook()
+    snapshot(book, bids=[(9, 1), (10, 1)], asks=[(12, 1)])
+    snapshot(book, bids=[(8, 1), (7, 0)])
+    assert book.bids.prices.tolist() == [8]
+    assert len(book.asks) == 0
+    assert book.top_ask() is None
+
+
+def test_snapshot_with_repeated_price_keeps_last_level():
+    book = DepthBook()
+    snapshot(book, bids=[(10, 1), (9, 1), (10, 2)], asks=[(12, 1), (12, 0)])
+    assert book.bids.prices.tolist() == [10, 9]
+    assert book.bids.sizes.tolist() == [2, 1]
+    assert len(book.asks) == 0
+    changed(book, bids=[(10, 0)])
+    assert book.bids.prices.tolist() == [9]
+
+
+def test_changed_inserts_updates_and_deletes_on_zero():
+    book = DepthBook()
+    snapshot(book, bids=[(10, 1)], asks=[(12, 1)])
+    changed(book, bids=[(11, 2), (9, 3)], asks=[(13, 4)])
+    assert book.bids.prices.tolist() == [11, 10, 9]
+    assert book.asks.prices.tolist() == [12, 13]
+    changed(book, bids=[(10, 5)], asks=[(12, 0)])
+    assert book.bids.sizes.tolist() == [2, 5, 3]
+    assert book.asks.prices.tolist() == [13]
+    # 存在しない価格の数量 0 は何もしない
+    changed(book, asks=[(20, 0)])
+    assert book.asks.prices.tolist() == [13]
+
+
+def test_capacity_evicts_farthest_levels():
+    book = DepthBook(capacity=3)
+    snapshot(book, bids=[(1, 1), (2, 1), (3, 1), (4, 1)], asks=[(5, 1), (6, 1), (7, 1), (8, 1)])
+    assert book.bids.prices.tolist() == [4, 3, 2]
+    assert book.asks.prices.tolist() == [5, 6, 7]
+    # 最良側に追加すると最も遠いレベルが押し出され、範囲外の追加は捨てる
+    changed(book, bids=[(5, 1), (1, 1)], asks=[(4, 1), (9, 1)])
+    assert book.bids.prices.tolist() == [5, 4, 3]
+    assert book.asks.prices.tolist() == [4, 5, 6]
@@ -1,33 +1,224 @@
 import os
 import time
 import json
+import functools
+import inspect
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote_plus
 import base64
 import asyncio
+import random
+import warnings
 import websockets
-from web3 import Web3
-from starkware.crypto.signature.signature import sign, private_key_to_ec_point_on_stark_curve
-import traceback
-from websockets.exceptions import InvalidStatusCode, WebSocketException
-import re
+from Crypto.Hash import keccak
+from starkware.crypto.signature.signature import private_key_to_ec_point_on_stark_curve
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK, InvalidStatusCode, WebSocketException
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from collections import deque
 from typing import Optional, List, Dict, Any
 
+# JSON は orjson（C実装）があれば優先し、無ければ標準の json を使う
+# orjson.JSONDecodeError は json.JSONDecodeError のサブクラスのため、例外は json.JSONDecodeError で捕捉できる
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+def _json_dumps(obj) -> str:
+    """ コンパクトな JSON 文字列を返す（websockets は str をテキストフレームとして送信する） """
+    return _json_dumps_bytes(obj).decode()
+
+try:
+    import httpx
+    # 送信前に失敗したことが確実な（POST でも再送してよい）通信エラー
+    _CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+except ImportError:  # 非同期 REST（send_api_request_async）を使う場合のみ必要
+    httpx = None
+
+# 署名はネイティブ実装（fast-stark-crypto）があれば優先し、無ければ純Python実装を使う
+# どちらも RFC6979 による決定的な k を用いるため、同じ入力から同じ (r, s) が得られる
+try:
+    from fast_stark_crypto import sign as _native_sign
+
+    def sign(msg_hash: int, priv_key: int):
+        # fast_stark_crypto は引数順が (private_key, msg_hash)
+        return _native_sign(priv_key, msg_hash)
+except ImportError:
+    from starkware.crypto.signature.signature import sign
+
+logger = logging.getLogger(__name__)
+
+
+def setup_queue_logging(level=logging.INFO, handler: Optional[logging.Handler] = None) -> QueueListener:
+    """
+    ルートロガーの出力を QueueHandler 経由で別スレッド（QueueListener）に任せる（logging.basicConfig の代わり）。
+    ログを有効にしても、標準エラーへの書き込みで WebSocket の受信ループ（イベントループ）を止めない。
+    終了時は戻り値の listener を stop() して、キューに残ったログを書き出すこと。
+
+    :param level: ルートロガーのレベル
+    :param handler: 実際に出力するハンドラー（省略時は basicConfig と同じ書式で標準エラーへ出力）
+    """
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
 # 定数: K_MODULUS（公式実装の値）
 K_MODULUS = int("0800000000000010ffffffffffffffffb781126dcae7b2321e66a241adc64d2f", 16)
 
+# デフォルトのシークレットファイル
+_SECRETS_PATH = os.path.join(os.path.dirname(__file__), "..", "secrets", "secret.json")
+
+@functools.lru_cache(maxsize=1)
+def _load_secrets(path: str) -> dict:
+    """ シークレットファイルを読み込む（プロセス内で一度だけ読み込み、以降はキャッシュを返す） """
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+# PING / PONG フレームのテンプレート（_json_dumps と同じコンパクトな形式）
+_PING_TEMPLATE = '{"type":"ping","time":"%d"}'
+_PONG_TEMPLATE = '{"type":"pong","time":"%s"}'
+
+def _ping_time(message):
+    """ PING メッセージ（{"type":"ping","time":"..."}）なら time の値を返し、それ以外は None を返す """
+    if isinstance(message, bytes):
+        if b'"type":"ping"' not in message[:64]:
+            return None
+        message = message.decode()
+    elif '"type":"ping"' not in message[:64]:
+        return None
+    start = message.find('"time":"')
+    if start < 0:
+        return None
+    start += len('"time":"')
+    end = message.find('"', start)
+    return message[start:end] if end >= 0 else None
+
+def _parse_json(response):
+    """
+    REST レスポンスの本文（bytes）をそのまま _json_loads でデコードする。
+    response.json() のように文字コードを推定して str に変換する処理を省く（requests / httpx のどちらのレスポンスでも使える）。
+    """
+    return _json_loads(response.content)
+
+def _page_data(method_name: str, response) -> dict:
+    """ ページング API のレスポンスから data（dataList, nextPageOffsetData）を取り出す。失敗時は例外にする """
+    if not isinstance(response, dict) or response.get("code") != "SUCCESS":
+        raise RuntimeError(f"{method_name} failed: {response}")
+    return response.get("data") or {}
+
+# リトライ対象の HTTP ステータス（それ以外の 4xx は即座に返す）
+_RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+def _backoff_wait(attempt: int, base_wait: float, max_wait: float) -> float:
+    """ attempt 回目のリトライまでの待機時間（指数バックオフ、上限 max_wait 秒 + 最大 0.1 秒のジッター） """
+    return min(max_wait, base_wait * (2 ** (attempt - 1))) + random.uniform(0, 0.1)
+
+class _CappedRetry(Retry):
+    """
+    待機時間を最大 5 秒 + 最大 0.1 秒のジッターに抑えた Retry。
+    backoff_max / backoff_jitter 引数は urllib3 2.x にしか無いため、urllib3 1.26 でも動くよう get_backoff_time で上限を掛ける
+    """
+    BACKOFF_CAP = 5.0
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:  # 初回のリトライは待たない（urllib3 の既定の動作）
+            return 0
+        return min(self.BACKOFF_CAP, backoff) + random.uniform(0, 0.1)
+
+# memory に保存する Public チャンネル（classify_channel の分類）と Private イベント
+_PUBLIC_CHANNELS = ("kline", "depth", "trades")
+_PRIVATE_EVENTS = (
+    "ACCOUNT_UPDATE", "DEPOSIT_UPDATE", "WITHDRAW_UPDATE", "TRANSFER_IN_UPDATE", "TRANSFER_OUT_UPDATE",
+    "ORDER_UPDATE", "FORCE_WITHDRAW_UPDATE", "FORCE_TRADE_UPDATE", "FUNDING_SETTLEMENT",
+    "ORDER_FILL_FEE_INCOME", "START_LIQUIDATING", "FINISH_LIQUIDATING",
+)
+
+def _drop_none(query_params: Optional[dict]) -> dict:
+    """
+    値が None のクエリパラメータを除いた辞書を返す（None を含まない場合は同じ辞書を返す）。
+    requests は None の値を送信しないため、署名対象のクエリ文字列からも除かないと署名が一致しない。
+    """
+    if not query_params:
+        return {}
+    if None not in query_params.values():
+        return query_params
+    return {k: v for k, v in query_params.items() if v is not None}
+
+# クエリパラメータのキー構成（挿入順のタプル）→ ソート済みキー。API ごとにキー構成は固定のため毎回のソートを省く
+_SORTED_KEYS_CACHE = {}
+
+def _sorted_keys(query_params: dict) -> tuple:
+    shape = tuple(query_params)
+    keys = _SORTED_KEYS_CACHE.get(shape)
+    if keys is None:
+        keys = tuple(sorted(shape))
+        if len(_SORTED_KEYS_CACHE) < 1024:
+            _SORTED_KEYS_CACHE[shape] = keys
+    return keys
+
+def _canonical_query(query_params: dict) -> str:
+    """ 署名対象のクエリ文字列（キーのアルファベット順に key=value を & で連結）を返す """
+    # join にはジェネレーターよりリストを渡す方が速い
+    return "&".join([f"{k}={query_params[k]}" for k in _sorted_keys(query_params)])
+
+def _with_query(url: str, query_params: dict) -> str:
+    """
+    署名と同じキー順・同じ値（str）でクエリ文字列を組み立てて URL に付ける。
+    requests / httpx の params= に任せると別途エンコードされ、順序や値の文字列化が署名とずれうるため。
+    値は requests の params= と同じく quote_plus でエンコードする。
+    """
+    if not query_params:
+        return url
+    query = "&".join([f"{k}={quote_plus(str(query_params[k]))}" for k in _sorted_keys(query_params)])
+    return url + ("&" if "?" in url else "?") + query
+
+
 class EdgeXAPIClient:
-    def __init__(self, private_key_hex: str = None, account_id: str = None, save_memory=False, max_memory=100):
+    # 受信処理で頻繁に参照する属性のアクセスを速くし、インスタンスを小さくする
+    # （新しい属性を __init__ に追加する場合はここにも追加すること）
+    __slots__ = (
+        "private_key_hex", "account_id", "private_key_int", "public_key_y_hex",
+        "base_url", "ws_url", "_url_cache", "_session", "_pool", "timeout", "_httpx",
+        "ping_interval", "ping_timeout", "app_ping", "ws_max_size", "reconnect_max_wait", "ws_standby", "rx_queue_size", "rx_workers", "rx_dropped",
+        "_ws_stops", "_active_websockets", "_channel_categories",
+        "save_memory", "max_memory", "memory", "ring", "_ring_rows", "books", "_depth_book",
+        "event_callbacks", "channel_callbacks", "_offload_event_callbacks", "_offload_channel_callbacks",
+    )
+
+    def __init__(self, private_key_hex: str = None, account_id: str = None, save_memory=False, max_memory=100,
+                 ring_memory=False, depth_book=False):
         """
         EdgeX API クライアント
         - save_memory: True なら WebSocket データを保存（quote-event, snapshot は保存しない）
         - max_memory: 各イベント・チャンネルごとの最大保存数（FIFOキュー形式）
+          memory[...][...] は古い順に並び、最新データは末尾（index=-1）。上限を超えると先頭（最古）から削除される
+        - ring_memory: True なら kline / trades を memory の代わりに ring[...]（NumPy 構造化配列のリングバッファ、
+          最大 max_memory 行）へ保存する。numpy が必要
+        - depth_book: True なら depth チャンネルの更新を books[contractId]（NumPy 配列の DepthBook）に反映する。
+          最良気配は books[contractId].top_bid() / top_ask() で取得できる。numpy が必要
         """
         # シークレット情報が渡されなければ secrets/secret.json から読み込む
         if private_key_hex is None or account_id is None:
-            secrets_path = os.path.join(os.path.dirname(__file__), "..", "secrets", "secret.json")
-            with open(secrets_path, "r") as f:
-                secrets = json.load(f)
+            secrets = _load_secrets(_SECRETS_PATH)
             if private_key_hex is None:
                 private_key_hex = secrets["PRIVATE_KEY_HEX"]
             if account_id is None:
@@ -36,45 +227,103 @@ class EdgeXAPIClient:
         self.private_key_hex = private_key_hex[2:] if private_key_hex.startswith("0x") else private_key_hex
         self.account_id = account_id
 
+        # 秘密鍵は不変のため、整数値と公開鍵Y座標（16進64桁）を一度だけ計算してキャッシュする
+        self.private_key_int = int(self.private_key_hex, 16)
+        public_key = private_key_to_ec_point_on_stark_curve(self.private_key_int)
+        self.public_key_y_hex = f"{public_key[1]:064x}"
+
         # APIのベースURL
         self.base_url = "https://pro.edgex.exchange"
         self.ws_url = "wss://quote.edgex.exchange"
-
-        self.ping_interval = 30  # サーバーの仕様に応じて変更可能
+        # HTTPメソッド → エンドポイント → (base_url, account_id, URL, 署名対象のパス)（_resolve_endpoint のキャッシュ）
+        self._url_cache = {"GET": {}, "POST": {}}
+
+        # REST 通信用のセッション（keep-alive で TCP/TLS 接続を使い回す）
+        # リトライは urllib3 に任せる（通信エラーと 429/5xx のみ。指数バックオフ + ジッター、上限 5 秒。
+        # Retry-After ヘッダーがあればそれに従う）。読み取りタイムアウトと 429/5xx のリトライは GET のみ。
+        # POST（注文・出金など）はサーバーに届いた可能性があるため、接続できなかった場合のみ再送する
+        retry = _CappedRetry(total=3, backoff_factor=1.0, status_forcelist=_RETRY_STATUS,
+                             allowed_methods=frozenset(["GET"]), respect_retry_after_header=True,
+                             raise_on_status=False)
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry))
+        # 注文・取消（create_order / cancel_*）用の urllib3 プール。requests のアダプター・フック・Cookie 処理を
+        # 経由しない分、1 リクエストあたり数百マイクロ秒短くなる（POST 専用のため接続エラーのみリトライする）
+        post_retry = _CappedRetry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=1.0,
+                                  raise_on_status=False)
+        self._pool = urllib3.PoolManager(num_pools=2, maxsize=32, block=False, retries=post_retry)
+        self.timeout = (3, 10)  # REST 通信のタイムアウト（接続, 読み取り）秒
+        # 非同期 REST 通信用のクライアント（send_api_request_async の初回呼び出し時に生成）
+        self._httpx = None
+
+        self.ping_interval = 20  # プロトコルレベルの PING の送信間隔（秒）。サーバーの仕様に応じて変更可能
+        self.ping_timeout = 7.5  # PING に対する PONG の待ち時間（秒）。超えると切断して再接続する
+        self.app_ping = False  # True なら接続ごとに send_ping（アプリケーションレベルの PING）を ping_interval 秒ごとに送る
+        self.ws_max_size = 2 ** 22  # 受信メッセージの最大サイズ（バイト）
+        self.reconnect_max_wait = 30  # 再接続までの最大待機時間（秒、ジッターは別途加算）
+        self.ws_standby = 0  # Public 接続で張っておく予備接続の数（1 以上なら切断時に TLS/WebSocket ハンドシェイクを待たずに切り替える）
+        self.rx_queue_size = 10000  # 受信キューの上限（超えた場合は最も古いメッセージを破棄）
+        self.rx_workers = 1  # 受信メッセージを処理するワーカー数（2以上ならチャンネル単位で振り分ける）
+        self.rx_dropped = 0  # 受信キューが満杯で破棄したメッセージの累計数
+        self._ws_stops = set()  # 実行中の _ws_loop ごとの停止イベント（stop_websockets() でまとめてセットする）
+        self._active_websockets = set()
+        # チャンネル名 → 分類（classify_channel のキャッシュ）
+        self._channel_categories = {}
 
         self.save_memory = save_memory
         self.max_memory = max_memory
 
         # メモリ（チャンネル & イベントごとにデータを保存）
         self.memory = {
-            "public": {
-                "kline": deque(maxlen=self.max_memory),
-                "depth": deque(maxlen=self.max_memory),
-                "trades": deque(maxlen=self.max_memory)
-            },
-            "private": {
-                "ACCOUNT_UPDATE": deque(maxlen=self.max_memory),
-                "DEPOSIT_UPDATE": deque(maxlen=self.max_memory),
-                "WITHDRAW_UPDATE": deque(maxlen=self.max_memory),
-                "TRANSFER_IN_UPDATE": deque(maxlen=self.max_memory),
-                "TRANSFER_OUT_UPDATE": deque(maxlen=self.max_memory),
-                "ORDER_UPDATE": deque(maxlen=self.max_memory),
-                "FORCE_WITHDRAW_UPDATE": deque(maxlen=self.max_memory),
-                "FORCE_TRADE_UPDATE": deque(maxlen=self.max_memory),
-                "FUNDING_SETTLEMENT": deque(maxlen=self.max_memory),
-                "ORDER_FILL_FEE_INCOME": deque(maxlen=self.max_memory),
-                "START_LIQUIDATING": deque(maxlen=self.max_memory),
-                "FINISH_LIQUIDATING": deque(maxlen=self.max_memory)
-            }
+            "public": {channel: deque(maxlen=max_memory) for channel in _PUBLIC_CHANNELS},
+            "private": {event: deque(maxlen=max_memory) for event in _PRIVATE_EVENTS},
         }
 
+        # NumPy リングバッファ（ring_memory=True の場合のみ。チャンネル分類 → RingBuffer）
+        self.ring = {}
+        self._ring_rows = {}
+        if ring_memory:
+            from .ring_buffer import RING_CHANNELS, RingBuffer
+            for channel, (dtype, rows) in RING_CHANNELS.items():
+                self.ring[channel] = RingBuffer(dtype, self.max_memory)
+                self._ring_rows[channel] = rows
+
+        # オーダーブック（depth_book=True の場合のみ。contractId → DepthBook）
+        self.books = {}
+        self._depth_book = None
+        if depth_book:
+            from .depth_book import DepthBook
+            self._depth_book = DepthBook
+
         # ✅ コールバック関数の登録（イベント or チャンネルごと）
         self.event_callbacks = {}
         self.channel_callbacks = {}
+        # offload=True で登録したコールバック（名前 → callback。直接差し替えられた場合は通常どおり実行する）
+        self._offload_event_callbacks = {}
+        self._offload_channel_callbacks = {}
+
+    def close(self):
+        """ REST 通信用のセッションを閉じ、プール中の接続を解放 """
+        self._session.close()
+        self._pool.clear()
 
-    def register_event_callback(self, event, callback):
+    async def aclose(self):
+        """ 非同期 REST 通信用のクライアントを閉じる """
+        if self._httpx is not None:
+            await self._httpx.aclose()
+            self._httpx = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def register_event_callback(self, event, callback, offload=False):
         """
         特定のイベントに対するコールバック関数を登録
+        callback は async def / 通常の関数のどちらでもよい（戻り値が awaitable の場合のみ await する）。
+        offload=True の場合、通常の関数をスレッドプールで実行する（重い同期処理向け）。
 
         登録できるイベント名（Private WebSocketイベント）:
         - "ACCOUNT_UPDATE"           👤 アカウント更新
@@ -91,10 +340,12 @@ class EdgeXAPIClient:
         - "FINISH_LIQUIDATING"       ✅ 清算完了
         """
         self.event_callbacks[event] = callback
+        self._set_offload(self._offload_event_callbacks, event, callback, offload)
 
-    def register_channel_callback(self, channel, callback):
+    def register_channel_callback(self, channel, callback, offload=False):
         """
         特定のチャンネルに対するコールバック関数を登録
+        callback / offload の扱いは register_event_callback と同じ。
 
         登録できるチャンネル名（Public WebSocketチャンネル）:
         - "kline"   📈 K-Line（ローソク足データ）
@@ -103,42 +354,65 @@ class EdgeXAPIClient:
         - "quote"   💬 Quote（特別扱い: メモリに保存しない）
         """
         self.channel_callbacks[channel] = callback
+        self._set_offload(self._offload_channel_callbacks, channel, callback, offload)
+
+    @staticmethod
+    def _set_offload(offload_callbacks, name, callback, offload):
+        """ offload=True で登録されたコールバックを名前ごとに記録する """
+        if offload:
+            offload_callbacks[name] = callback
+        else:
+            offload_callbacks.pop(name, None)
+
+    @staticmethod
+    async def _run_callback(callback, data, offload=False):
+        """
+        コールバックを実行する（offload=True ならスレッドプールで実行）。
+        戻り値が awaitable（async def・async な __call__・コルーチンを返す partial / lambda など）なら await し、
+        通常の関数は await のオーバーヘッドなしで呼ぶ。
+        """
+        if offload:
+            result = await asyncio.get_running_loop().run_in_executor(None, callback, data)
+        else:
+            result = callback(data)
+        if inspect.isawaitable(result):
+            await result
 
-    def generate_signature_headers(self, http_method: str, request_path: str, query_params: dict) -> dict:
+    def generate_signature_headers(self, http_method: str, request_path: str, query_params: dict,
+                                   sorted_query: Optional[str] = None) -> dict:
         """
         指定された HTTP メソッド、リクエストパス、クエリパラメータから署名付きヘッダーを生成します。
+        sorted_query に連結済みのクエリ文字列を渡すと、ソート・連結を省略します。
         """
-        # タイムスタンプ（ミリ秒）
-        timestamp = str(int(time.time() * 1000))
+        # タイムスタンプ（ミリ秒）。float を経由しないよう time_ns から求める
+        timestamp = str(time.time_ns() // 1_000_000)
         # クエリパラメータはアルファベット順に連結
-        sorted_query = "&".join(f"{k}={query_params[k]}" for k in sorted(query_params))
+        if sorted_query is None:
+            sorted_query = _canonical_query(query_params)
         # 署名対象の文字列
         message = f"{timestamp}{http_method}{request_path}{sorted_query}"
-        print("Message for signing:", message)
+        logger.debug("Message for signing: %s", message)
 
         # Keccak-256 ハッシュ計算
-        msg_hash_bytes = Web3.keccak(text=message)
+        msg_hash_bytes = keccak.new(digest_bits=256, data=message.encode()).digest()
         msg_hash_int = int.from_bytes(msg_hash_bytes, byteorder="big")
         # 公式実装に合わせ、ハッシュ値を K_MODULUS で剰余
         msg_hash_int = msg_hash_int % K_MODULUS
-        print("Reduced message hash (int):", msg_hash_int)
+        logger.debug("Reduced message hash (int): %s", msg_hash_int)
 
         # 署名生成
-        private_key_int = int(self.private_key_hex, 16)
-        r, s = sign(msg_hash_int, private_key_int)
-        print("Signature components:")
-        print(" r =", hex(r))
-        print(" s =", hex(s))
-
-        # 公開鍵の導出 (EC点： (x, y))
-        public_key = private_key_to_ec_point_on_stark_curve(private_key_int)
-        public_key_y = public_key[1]
-        print("Public key Y coordinate:", hex(public_key_y))
+        r, s = sign(msg_hash_int, self.private_key_int)
 
         # 最終署名: r || s || publicKeyYCoordinate（各32バイト、16進64桁で連結）
-        signature_hex = f"{r:064x}{s:064x}{public_key_y:064x}"
-        print("Final Signature (hex):", signature_hex)
-        print("Signature Length:", len(signature_hex))
+        # 公開鍵Y座標は __init__ でキャッシュ済み
+        # 256bit 整数の16進化は to_bytes().hex() の方が書式指定（:064x）より高速
+        signature_hex = r.to_bytes(32, "big").hex() + s.to_bytes(32, "big").hex() + self.public_key_y_hex
+
+        # 16進変換のコストを避けるため、DEBUG が有効な場合のみ詳細を出力する
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Signature components: r=%s s=%s", hex(r), hex(s))
+            logger.debug("Public key Y coordinate: %s", self.public_key_y_hex)
+            logger.debug("Final Signature (hex): %s (length=%d)", signature_hex, len(signature_hex))
 
         headers = {
             "X-edgeX-Api-Signature": signature_hex,
@@ -148,55 +422,219 @@ class EdgeXAPIClient:
 
     # RESTful APIでの通信
     def send_api_request(self, http_method: str, endpoint: str, query_params: dict = None,
-                        data: dict = None, retries: int = 3, base_wait: float = 1.0,
-                        max_wait: float = 5.0, auth_required: bool = True):
+                        data: dict = None, retries: int = None, base_wait: float = None,
+                        max_wait: float = None, auth_required: bool = True):
         """
         BASE_URL に対して、指定されたエンドポイント、HTTPメソッド、クエリパラメータでリクエストを送信します。
-        リトライ時は線形に待機時間を増加させ、上限を設けます。
+        通信エラーや 429/5xx のリトライはセッションに設定した urllib3 の Retry が行います（同じ署名で再送）。
+        POST は二重発注を避けるため、接続エラーの場合のみリトライします。
 
         :param http_method: HTTPメソッド（"GET" または "POST"）
         :param endpoint: APIエンドポイント
         :param query_params: クエリパラメータ
         :param data: POSTデータ
-        :param retries: 最大リトライ回数
-        :param base_wait: 初回リトライの待機時間（秒）
-        :param max_wait: 最大待機時間（秒）
+        :param retries: 非推奨（無視されます）。リトライ回数はセッションの Retry（最大 3 回）に従います
+        :param base_wait: 非推奨（無視されます）。初回の待機時間はセッションの Retry（1 秒）に従います
+        :param max_wait: 非推奨（無視されます）。最大待機時間はセッションの Retry（5 秒）に従います
         :param auth_required: 認証が必要か（デフォルトは `True`、パブリック API は `False`）
         :return: APIレスポンス（JSON）
         """
-        url = self.base_url + endpoint
-        convertedEndpoint = endpoint
-        if http_method == 'POST':
-            param = 'accountId=' + self.account_id
-            url = url +  '?' + param
-            convertedEndpoint = endpoint + param
+        if retries is not None or base_wait is not None or max_wait is not None:
+            # 以前のシグネチャ（send_api_request_async と共通）との互換のために受け付ける
+            warnings.warn("send_api_request: retries / base_wait / max_wait are ignored; "
+                          "retries follow the session's urllib3 Retry", DeprecationWarning, stacklevel=2)
+        http_method = http_method.upper()
+        if http_method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {http_method}")
+        url, convertedEndpoint = self._resolve_endpoint(http_method, endpoint)
+
+        query_params = _drop_none(query_params)
+        # 署名対象のクエリ文字列は再署名時も変わらないため一度だけ組み立てる
+        sorted_query = _canonical_query(query_params) if auth_required else None
+
+        # ボディは requests の json= （標準の json）を使わず、orjson で一度だけシリアライズする
+        body = _json_dumps_bytes(data) if data is not None and http_method == "POST" else None
+
+        # 認証ヘッダーが必要な場合のみ追加
+        headers = self.generate_signature_headers(http_method, convertedEndpoint, query_params, sorted_query) if auth_required else {}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        url = _with_query(url, query_params)
+        logger.debug("Sending %s request to %s", http_method, url)
+        response = self._session.request(http_method, url, headers=headers, data=body, timeout=self.timeout)
+
+        if auth_required and response.status_code == 401:
+            # 署名（タイムスタンプ）の期限切れとみなし、一度だけ署名し直して再送する
+            logger.warning("Request unauthorized (401). Re-signing and retrying once...")
+            headers.update(self.generate_signature_headers(http_method, convertedEndpoint, query_params, sorted_query))
+            response = self._session.request(http_method, url, headers=headers, data=body, timeout=self.timeout)
+
+        return _parse_json(response)
+
+    def _post_direct(self, endpoint: str, data: dict):
+        """
+        send_api_request("POST", endpoint, data=data) と同じ処理を requests を介さず urllib3 のプールで行います。
+        注文・取消など遅延が効く API 用。通信エラーは requests ではなく urllib3 の例外（MaxRetryError など）になります。
+        """
+        url, convertedEndpoint = self._resolve_endpoint("POST", endpoint)
+        body = _json_dumps_bytes(data)
+        headers = self.generate_signature_headers("POST", convertedEndpoint, {}, "")
+        headers["Content-Type"] = "application/json"
+        timeout = urllib3.Timeout(connect=self.timeout[0], read=self.timeout[1])
+
+        logger.debug("Sending POST request to %s", url)
+        response = self._pool.urlopen("POST", url, body=body, headers=headers, timeout=timeout)
+
+        if response.status == 401:
+            # 署名（タイムスタンプ）の期限切れとみなし、一度だけ署名し直して再送する
+            logger.warning("Request unauthorized (401). Re-signing and retrying once...")
+            headers.update(self.generate_signature_headers("POST", convertedEndpoint, {}, ""))
+            response = self._pool.urlopen("POST", url, body=body, headers=headers, timeout=timeout)
+
+        return _json_loads(response.data)
+
+    async def send_api_request_async(self, http_method: str, endpoint: str, query_params: dict = None,
+                                     data: dict = None, retries: int = 3, base_wait: float = 1.0,
+                                     max_wait: float = 5.0, auth_required: bool = True):
+        """
+        send_api_request の非同期版。httpx.AsyncClient（HTTP/2）で送信するため、イベントループを止めません。
+        戻り値は send_api_request と同じです。httpx のインストールが必要です。
+        通信エラーと 429/5xx の場合のみ、指数バックオフ（+ジッター）でリトライします（retries: 最大リトライ回数、
+        base_wait: 初回リトライの待機時間（秒）、max_wait: 最大待機時間（秒））。
+        POST は二重発注を避けるため、接続エラーの場合のみリトライします。
+        """
+        if httpx is None:
+            raise RuntimeError("send_api_request_async requires httpx (pip install 'httpx[http2]')")
+        if self._httpx is None:
+            timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            # HTTP/1.1 にフォールバックした場合に備え、保持する接続数は同期セッションのプール（32）に揃える
+            limits = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+            try:
+                self._httpx = httpx.AsyncClient(http2=True, timeout=timeout, limits=limits)
+            except ImportError:  # h2 が無い環境では HTTP/1.1 で接続する
+                self._httpx = httpx.AsyncClient(timeout=timeout, limits=limits)
+
+        http_method = http_method.upper()
+        if http_method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {http_method}")
+        url, convertedEndpoint = self._resolve_endpoint(http_method, endpoint)
 
         attempt = 0
-        query_params = query_params or {}  # None の場合、空の辞書をセット
+        query_params = _drop_none(query_params)
+        # 署名対象のクエリ文字列はリトライ間で変わらないため一度だけ組み立てる
+        sorted_query = _canonical_query(query_params) if auth_required else None
+
+        # ボディは httpx の json= （標準の json）を使わず、orjson で一度だけシリアライズする
+        body = _json_dumps_bytes(data) if data is not None and http_method == "POST" else None
+
+        # 認証ヘッダーが必要な場合のみ追加。通信エラーによるリトライでは同じ署名を使い回す
+        headers = self.generate_signature_headers(http_method, convertedEndpoint, query_params, sorted_query) if auth_required else {}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        url = _with_query(url, query_params)
 
-        while attempt <= retries:
+        while True:
+            logger.debug("Attempt %d: Sending %s request to %s", attempt + 1, http_method, url)
             try:
-                # 認証ヘッダーが必要な場合のみ追加
-                headers = self.generate_signature_headers(http_method, convertedEndpoint, query_params) if auth_required else {}
+                response = await self._httpx.request(http_method, url, headers=headers, content=body)
+            except httpx.TransportError as e:
+                # 接続エラー・タイムアウトなど通信レベルのエラーのみリトライする
+                # （POST は送信済みの可能性がある読み取りタイムアウトなどでは再送しない）
+                if attempt >= retries or (http_method == "POST" and not isinstance(e, _CONNECT_ERRORS)):
+                    raise
+                attempt += 1
+                wait_time = _backoff_wait(attempt, base_wait, max_wait)
+                logger.warning("Request failed: %s. Retrying in %.2f seconds (attempt %d/%d)...",
+                               e, wait_time, attempt, retries)
+                await asyncio.sleep(wait_time)
+                continue
+
+            if attempt < retries:
+                if auth_required and response.status_code == 401:
+                    # 署名（タイムスタンプ）の期限切れとみなし、署名し直して再送する
+                    attempt += 1
+                    logger.warning("Request unauthorized (401). Re-signing and retrying (attempt %d/%d)...", attempt, retries)
+                    headers.update(self.generate_signature_headers(http_method, convertedEndpoint, query_params, sorted_query))
+                    continue
+                if response.status_code in _RETRY_STATUS and http_method == "GET":
+                    attempt += 1
+                    wait_time = _backoff_wait(attempt, base_wait, max_wait)
+                    logger.warning("Request failed with HTTP %d. Retrying in %.2f seconds (attempt %d/%d)...",
+                                   response.status_code, wait_time, attempt, retries)
+                    await asyncio.sleep(wait_time)
+                    continue
+
+            # その他の 4xx などはリトライせずにそのまま返す
+            return _parse_json(response)
+
+    async def send_many(self, requests_list, auth_required: bool = True):
+        """
+        複数のリクエストをスレッドプールで並行して送信します（署名生成と通信を重ねて実行）。
+        REST セッションは send_api_request と共有します。
 
-                print(f"Attempt {attempt + 1}: Sending {http_method} request to {url}")
+        :param requests_list: (http_method, endpoint, query_params[, data]) のリスト
+        :param auth_required: 認証が必要か（全リクエスト共通）
+        :return: 各リクエストのAPIレスポンス（JSON）のリスト（requests_list と同じ順序）
+        """
+        return await asyncio.gather(*(
+            asyncio.to_thread(self.send_api_request, http_method, endpoint, query_params,
+                              rest[0] if rest else None, auth_required=auth_required)
+            for http_method, endpoint, query_params, *rest in requests_list
+        ))
 
-                if http_method.upper() == "GET":
-                    response = requests.get(url, headers=headers, params=query_params)
-                elif http_method.upper() == "POST":
-                    response = requests.post(url, headers=headers, params=query_params, json=data)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {http_method}")
+    async def run_batch(self, calls):
+        """
+        複数の API メソッドをスレッドプールで並行して呼び出します。
 
-                return response.json()
+        :param calls: (メソッド名, キーワード引数の辞書) のリスト（例: [("get_ticker", {"contract_id": "10000001"})]）
+        :return: 各メソッドの戻り値のリスト（calls と同じ順序）
+        """
+        return await asyncio.gather(*(
+            asyncio.to_thread(getattr(self, method_name), **kwargs) for method_name, kwargs in calls
+        ))
 
-            except Exception as e:
-                attempt += 1
-                if attempt > retries:
-                    raise e
-                wait_time = min(base_wait * attempt, max_wait)
-                print(f"Request failed: {e}. Retrying in {wait_time} seconds (attempt {attempt}/{retries})...")
-                time.sleep(wait_time)
+    def run_batch_sync(self, calls):
+        """ run_batch の同期版（イベントループの外から呼び出す） """
+        return asyncio.run(self.run_batch(calls))
+
+    def iter_page_items(self, method_name: str, **kwargs):
+        """
+        ページング API（offset_data を受け取る *_page メソッド）の data.dataList を先頭から 1 件ずつ返すジェネレーター。
+        nextPageOffsetData をたどって必要になった時点で次のページを取得するため、保持するのは常に 1 ページ分だけ。
+
+        例: for order in client.iter_page_items("get_history_order_page", account_id=account_id, size="100"): ...
+
+        :param method_name: 呼び出すメソッド名
+        :param kwargs: メソッドに渡すキーワード引数（offset_data を渡すとそのページから始める）
+        """
+        method = getattr(self, method_name)
+        while True:
+            response = method(**kwargs)
+            page = _page_data(method_name, response)
+            yield from page.get("dataList") or ()
+            kwargs["offset_data"] = page.get("nextPageOffsetData")
+            if not kwargs["offset_data"]:
+                return
+
+    def _resolve_endpoint(self, http_method: str, endpoint: str):
+        """
+        リクエスト先URLと署名対象のパスを返します。
+        POST はクエリに accountId を付与し、署名対象のパスにも連結します。
+        結果はエンドポイントごとにキャッシュします（base_url / account_id を変更した場合は作り直す）。
+        """
+        cached = self._url_cache[http_method].get(endpoint)
+        if cached is not None and cached[0] is self.base_url and cached[1] is self.account_id:
+            return cached[2], cached[3]
+
+        url = self.base_url + endpoint
+        convertedEndpoint = endpoint
+        if http_method == 'POST':
+            param = 'accountId=' + self.account_id
+            url = url +  '?' + param
+            convertedEndpoint = endpoint + param
+        self._url_cache[http_method][endpoint] = (self.base_url, self.account_id, url, convertedEndpoint)
+        return url, convertedEndpoint
 
     # Public API
     def get_server_time(self):
@@ -348,8 +786,7 @@ class EdgeXAPIClient:
             "filterBeginTimeInclusive": filter_begin_time_inclusive,
             "filterEndTimeExclusive": filter_end_time_exclusive
         }
-        # Remove keys with None values
-        query_params = {k: v for k, v in query_params.items() if v is not None}
+        # None の値は send_api_request 側で除かれる
         return self.send_api_request("GET", endpoint, query_params, auth_required=False)
 
     # Private API
@@ -546,7 +983,7 @@ class EdgeXAPIClient:
     def create_order(self, payload: Dict[str, Any]):
         """POST /api/v1/private/order/createOrder"""
         endpoint = "/api/v1/private/order/createOrder"
-        return self.send_api_request("POST", endpoint, data=payload)
+        return self._post_direct(endpoint, payload)
 
     def cancel_order_by_id(self, account_id: str, order_id_list: List[str]):
         """POST /api/v1/private/order/cancelOrderById"""
@@ -555,7 +992,7 @@ class EdgeXAPIClient:
             "accountId": account_id,
             "orderIdList": order_id_list,
         }
-        return self.send_api_request("POST", endpoint, data=payload)
+        return self._post_direct(endpoint, payload)
 
     def cancel_all_order(self, account_id: str):
         """POST /api/v1/private/order/cancelAllOrder"""
@@ -563,7 +1000,7 @@ class EdgeXAPIClient:
         payload = {
             "accountId": account_id,
         }
-        return self.send_api_request("POST", endpoint, data=payload)
+        return self._post_direct(endpoint, payload)
 
     def get_order_by_id(
         self, account_id: str, order_id_list: str
@@ -777,23 +1214,32 @@ class EdgeXAPIClient:
 
     # WebSocketでの通信
     async def connect_public_websocket(self, channels=None):
-        """ WebSocket (パブリック) """
+        """ WebSocket (パブリック)。切断時は自動で再接続し、channels を購読し直す """
 
         endpoint = "/api/v1/public/ws"
         websocket_url = self.ws_url + endpoint
-        try:
-            async with websockets.connect(websocket_url) as websocket:
-                print("Connected to EdgeX Public WebSocket.")
-                # ここで購読リクエストを送信
-                if channels:
-                    await self.subscribe_channels(websocket, channels)
-
-                while True:
-                    message = await websocket.recv()
-                    print("Received:", message)
-                    await self.handle_message(websocket, message)
-        except Exception as e:
-            print(f"Failed to connect or error during communication: {e}")
+
+        # 購読フレームは接続のたびに同じ内容のため、最初に一度だけシリアライズして再接続時に使い回す
+        # （接続ごとのローカル変数にしておき、同時に張った別の接続の購読内容と混ざらないようにする）
+        channels = list(channels) if channels else []
+        subscribe_frames = [_json_dumps(channel) for channel in channels]
+
+        async def on_connect(websocket):
+            # ここで購読リクエストを送信
+            if subscribe_frames:
+                await self._send_subscribe_frames(websocket, subscribe_frames)
+                logger.debug("📡 サブスクライブ: %s", channels)
+
+        await self._ws_loop(websocket_url, "EdgeX Public WebSocket", on_connect=on_connect, use_standby=True)
+
+    def _connect_websocket(self, websocket_url, **kwargs):
+        """
+        共通オプション付きで WebSocket 接続を開始（async with で使用）
+        - compression=None: permessage-deflate を無効化し、フレームごとの解凍処理を省く
+        - max_size / ping_interval / ping_timeout: 受信サイズ上限とプロトコルレベルの死活監視
+        """
+        return websockets.connect(websocket_url, compression=None, max_size=self.ws_max_size,
+                                  ping_interval=self.ping_interval, ping_timeout=self.ping_timeout, **kwargs)
 
     async def subscribe_channels(self, websocket, channels):
         """
@@ -813,70 +1259,240 @@ class EdgeXAPIClient:
         指定できるチャンネルは以下の公式ドキュメントを参照
         https://edgex-1.gitbook.io/edgeX-documentation/api/websocket-api
         """
-        for channel in channels:
-            await websocket.send(json.dumps(channel))
-            print(f"📡 サブスクライブ: {channel}")
+        await self._send_subscribe_frames(websocket, [_json_dumps(channel) for channel in channels])
+        logger.debug("📡 サブスクライブ: %s", channels)
+
+    @staticmethod
+    async def _send_subscribe_frames(websocket, frames):
+        """ シリアライズ済みの購読フレームを送信 """
+        # サーバーは1フレーム1購読のため、各フレームの送信を待たずにまとめて発行する（送信順は維持される）
+        await asyncio.gather(*(websocket.send(frame) for frame in frames))
 
     async def connect_private_websocket_web(self):
-        """ WebSocket (ブラウザ向けのBase64方式) """
+        """ WebSocket (ブラウザ向けのBase64方式)。切断時は自動で再接続する """
 
         endpoint = "/api/v1/private/ws"
         param = "accountId=" + self.account_id
         websocket_url = self.ws_url + endpoint + "?" + param
 
-        headers = self.generate_signature_headers("GET", endpoint + param, {})
+        def connect_kwargs():
+            # 署名にはタイムスタンプが含まれるため、接続のたびに生成し直す
+            headers = self.generate_signature_headers("GET", endpoint + param, {})
 
-        # Base64エンコード
-        base64_auth = base64.b64encode(json.dumps(headers).encode()).decode()
-        # URLエンコードしてASCII文字列に変換
-        headers_json = json.dumps(headers)
-        safe_base64_auth = base64.urlsafe_b64encode(headers_json.encode()).decode().rstrip("=")
+            # JSON を URL セーフな Base64 でエンコードし、ASCII文字列に変換
+            headers_json = _json_dumps_bytes(headers)
+            safe_base64_auth = base64.urlsafe_b64encode(headers_json).rstrip(b"=").decode("ascii")
+            return {"subprotocols": [safe_base64_auth]}
 
-        try:
-            async with websockets.connect(websocket_url, subprotocols=[safe_base64_auth]) as websocket:
-                print("✅ Connected to EdgeX Private WebSocket (Browser Auth).")
-                while True:
-                    message = await websocket.recv()
-                    print("🔹 Received:", message)
-                    await self.handle_message(websocket, message)
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print("❌ エラー詳細:\n", error_details)  # 文字列として出力可能
+        await self._ws_loop(websocket_url, "EdgeX Private WebSocket (Browser Auth)", connect_kwargs=connect_kwargs)
 
     async def connect_private_websocket_app(self):
-        """ WebSocket (App/API用) """
+        """ WebSocket (App/API用)。切断時は自動で再接続する """
 
         endpoint = "/api/v1/private/ws"
         param = "accountId=" + self.account_id
         websocket_url = self.ws_url + endpoint + "?" + param
 
-        headers = self.generate_signature_headers("GET", endpoint + param, {})
+        def connect_kwargs():
+            # 署名にはタイムスタンプが含まれるため、接続のたびに生成し直す
+            return {"extra_headers": self.generate_signature_headers("GET", endpoint + param, {})}
 
-        try:
-            async with websockets.connect(websocket_url, extra_headers=headers) as websocket:
-                print("✅ Connected to EdgeX Private WebSocket.")
-                while True:
-                    message = await websocket.recv()
-                    print("🔹 Received:", message)
-                    await self.handle_message(websocket, message)
+        await self._ws_loop(websocket_url, "EdgeX Private WebSocket", connect_kwargs=connect_kwargs)
 
-        except InvalidStatusCode as e:
-            print(f"❌ HTTP Error {e.status_code}: Server rejected WebSocket connection")
-            print("🔍 Response Headers:", e.headers)
+    async def _ws_loop(self, websocket_url, label, connect_kwargs=None, on_connect=None, use_standby=False):
+        """
+        WebSocket の受信ループ。切断・エラー時は指数バックオフ（上限 reconnect_max_wait 秒 + ジッター）で再接続する。
+        stop_websockets() が呼ばれるまで継続する（停止はその時点で動いているループにだけ及び、後から開始したループは止めない）。
+
+        :param websocket_url: 接続先URL
+        :param label: ログ表示用の接続名
+        :param connect_kwargs: 接続ごとに websockets.connect へ渡す追加引数を返す関数
+        :param on_connect: 接続直後に呼ばれるコルーチン関数（購読リクエストの送信など）
+        :param use_standby: True なら接続中に ws_standby 本の予備接続を張っておき、切断時は待たずに予備へ切り替える
+            （予備接続では PING への応答だけを行うため、購読するまでデータが届かない Public 接続でのみ使う）
+        """
+        def dial():
+            kwargs = connect_kwargs() if connect_kwargs else {}
+            return self._connect_websocket(websocket_url, **kwargs)
 
-        except WebSocketException as e:
-            print("❌ WebSocket Error:", str(e))
+        stop = asyncio.Event()
+        self._ws_stops.add(stop)
+        attempt = 0
+        standby = deque()  # 接続済みの予備接続 (WebSocket, PING 応答タスク)
+        refill = None  # 予備接続を張るタスク
+        try:
+            while not stop.is_set():
+                try:
+                    websocket = await self._pop_standby(standby)
+                    if websocket is None:
+                        websocket = await dial()
+                    try:
+                        logger.info("✅ Connected to %s.", label)
+                        attempt = 0
+                        self._active_websockets.add(websocket)
+                        if use_standby and self.ws_standby > 0 and (refill is None or refill.done()):
+                            refill = asyncio.create_task(self._fill_standby(standby, dial, label, stop))
+                        await self._ws_receive(websocket, on_connect)
+                    finally:
+                        self._active_websockets.discard(websocket)
+                        await websocket.close()
+
+                except ConnectionClosedOK as e:
+                    # 正常なクローズ（close frame 1000/1001）。stop_websockets() 以外ならサーバー都合のため再接続する
+                    logger.info("👋 WebSocket connection closed: %s", e)
+
+                except ConnectionClosedError as e:
+                    logger.warning("⚠️ WebSocket connection lost: %s", e)
+
+                except InvalidStatusCode as e:
+                    logger.error("❌ HTTP Error %s: Server rejected WebSocket connection", e.status_code)
+                    logger.error("🔍 Response Headers: %s", e.headers)
+
+                except WebSocketException as e:
+                    logger.error("❌ WebSocket Error: %s", e)
+
+                except Exception:
+                    logger.exception("❌ エラー詳細")
+
+                if stop.is_set():
+                    break
+                if any(ws.open for ws, _ in standby):
+                    logger.info("🔄 Switching %s to a standby connection.", label)
+                    continue
+                wait_time = min(2 ** attempt, self.reconnect_max_wait) + random.random()
+                attempt += 1
+                logger.info("🔄 Reconnecting to %s in %.1f seconds (attempt %d)...", label, wait_time, attempt)
+                # 待機中に stop_websockets() が呼ばれたらすぐに抜ける
+                try:
+                    await asyncio.wait_for(stop.wait(), wait_time)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._ws_stops.discard(stop)
+            if refill is not None:
+                refill.cancel()
+                await asyncio.gather(refill, return_exceptions=True)
+            while standby:
+                websocket, reader = standby.popleft()
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+                await websocket.close()
+
+    async def _ws_receive(self, websocket, on_connect):
+        """ 1 接続分の受信ループ。受信ループはキューへの投入だけを行い、デコード・コールバック・保存はワーカーが処理する """
+        queues = [asyncio.Queue(maxsize=self.rx_queue_size) for _ in range(self.rx_workers)]
+        workers = [asyncio.create_task(self._rx_worker(websocket, q)) for q in queues]
+        ping_task = asyncio.create_task(self.send_ping(websocket)) if self.app_ping else None
+        try:
+            if on_connect:
+                await on_connect(websocket)
+            while True:
+                message = await websocket.recv()
+                rx_q = queues[self._rx_shard(message)] if len(queues) > 1 else queues[0]
+                self._rx_put(rx_q, message)
+        finally:
+            if ping_task is not None:
+                ping_task.cancel()
+                await asyncio.gather(ping_task, return_exceptions=True)
+            # キューに残った受信済みメッセージを処理し終えてからワーカーを終了する
+            # （終了の合図は古いメッセージを押し出さないよう、空きができるまで待って投入する）
+            for rx_q in queues:
+                await rx_q.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    @staticmethod
+    async def _pop_standby(standby):
+        """ 開いている予備接続を 1 本取り出し、PING 応答タスクを止めて返す（切れているものは捨てる）。無ければ None """
+        while standby:
+            websocket, reader = standby.popleft()
+            reader.cancel()  # recv() はキャンセルしても受信データを失わない
+            await asyncio.gather(reader, return_exceptions=True)
+            if websocket.open:
+                return websocket
+        return None
+
+    async def _standby_reader(self, websocket):
+        """ 予備接続でサーバーからの PING にだけ応答する（購読前のため、それ以外のメッセージは届かない） """
+        try:
+            while True:
+                message = await websocket.recv()
+                timestamp = _ping_time(message)
+                if timestamp is None:
+                    try:
+                        msg_json = _json_loads(message)
+                    except json.JSONDecodeError:
+                        continue
+                    if msg_json.get("type") != "ping":
+                        continue
+                    timestamp = msg_json.get("time", "")
+                await self.send_pong(websocket, timestamp)
+        except WebSocketException:
+            return  # 切れた予備接続は _pop_standby で捨てる
+
+    async def _fill_standby(self, standby, dial, label, stop):
+        """ 予備接続が ws_standby 本になるまで接続を張る（失敗した場合は次の接続時に再び試す） """
+        while len(standby) < self.ws_standby and not stop.is_set():
+            try:
+                websocket = await dial()
+                standby.append((websocket, asyncio.create_task(self._standby_reader(websocket))))
+            except (OSError, asyncio.TimeoutError, WebSocketException) as e:
+                logger.warning("⚠️ Standby connection to %s failed: %s", label, e)
+                return
+            logger.debug("Standby connection to %s ready (%d/%d)", label, len(standby), self.ws_standby)
+
+    async def _rx_worker(self, websocket, rx_q):
+        """ 受信キューからメッセージを取り出して処理（None で終了） """
+        while True:
+            message = await rx_q.get()
+            if message is None:
+                return
+            try:
+                await self.handle_message(websocket, message)
+            except Exception:
+                logger.exception("❌ メッセージ処理中のエラー")
 
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print("❌ エラー詳細:\n", error_details)
+    def _rx_put(self, rx_q, message):
+        """ 受信キューに投入。満杯の場合は最も古いメッセージを捨て、rx_dropped を増やす """
+        try:
+            rx_q.put_nowait(message)
+        except asyncio.QueueFull:
+            rx_q.get_nowait()
+            rx_q.put_nowait(message)
+            self.rx_dropped += 1
+            # 処理が追いつかない状態でログまで毎回出さないよう、最初の 1 件と以降 1000 件ごとに出力する
+            if self.rx_dropped == 1 or self.rx_dropped % 1000 == 0:
+                logger.warning("⚠️ 受信キューが満杯のため、最も古いメッセージを破棄しました（累計 %d 件）", self.rx_dropped)
+
+    def _rx_shard(self, message):
+        """ チャンネル名でワーカーを選ぶ（同じチャンネルのメッセージは同じワーカーで順番に処理される） """
+        marker = b'"channel":"' if isinstance(message, bytes) else '"channel":"'
+        start = message.find(marker)
+        if start < 0:
+            return 0
+        start += len(marker)
+        return hash(message[start:message.find(marker[-1:], start)]) % self.rx_workers
+
+    async def stop_websockets(self):
+        """ 自動再接続を止め、接続中の WebSocket を閉じる """
+        for stop in self._ws_stops:
+            stop.set()
+        for websocket in list(self._active_websockets):
+            await websocket.close()
 
     async def handle_message(self, websocket, message):
         """ サーバーからのメッセージを処理 """
-        print("🔹 Received:", message)
+        # 受信フレームごとに呼ばれるため、DEBUG 無効時はログ呼び出し自体を省く
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔹 Received: %s", message)
+
+        # サーバーからの PING は JSON 全体をパースせずに PONG を返す（高速パス）
+        timestamp = _ping_time(message)
+        if timestamp is not None:
+            await self.send_pong(websocket, timestamp)
+            return
 
         try:
-            msg_json = json.loads(message)
+            msg_json = _json_loads(message)
             msg_type = msg_json.get("type", "")
 
             if msg_type == "ping":
@@ -887,44 +1503,82 @@ class EdgeXAPIClient:
                 await self.process_data(msg_json)
 
         except json.JSONDecodeError:
-            print("⚠️ 受信メッセージのJSONデコードエラー")
+            logger.warning("⚠️ 受信メッセージのJSONデコードエラー")
 
     async def send_ping(self, websocket):
-        """ 定期的に PING を送信（クライアントからのレイテンシ測定用）"""
+        """ 定期的に PING を送信（クライアントからのレイテンシ測定用。app_ping=True なら接続中は自動で実行される）"""
+        loop = asyncio.get_running_loop()
         while True:
             await asyncio.sleep(self.ping_interval)
-            ping_message = json.dumps({"type": "ping", "time": str(int(asyncio.get_event_loop().time() * 1000))})
+            ping_message = _PING_TEMPLATE % int(loop.time() * 1000)
             await websocket.send(ping_message)
-            print("📤 Sent PING:", ping_message)
+            logger.debug("📤 Sent PING: %s", ping_message)
 
     async def send_pong(self, websocket, timestamp):
         """ サーバーからの PING に応答する PONG を送信 """
-        pong_message = json.dumps({"type": "pong", "time": timestamp})
+        # サーバーの time は数字のみの文字列のため、通常はエスケープ不要なテンプレートで組み立てる
+        if isinstance(timestamp, str) and timestamp.isdigit():
+            pong_message = _PONG_TEMPLATE % timestamp
+        else:
+            pong_message = _json_dumps({"type": "pong", "time": timestamp})
         await websocket.send(pong_message)
-        print("📤 Sent PONG:", pong_message)
+        logger.debug("📤 Sent PONG: %s", pong_message)
 
     async def process_data(self, data):
         """ WebSocket で受信したデータを処理し、登録された関数をトリガー """
 
         message_type = data.get("type", "")
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        if message_type in ['connected', 'subscribed']:
-            print(f"👤 接続処理: {data}")
+        # 受信頻度の高い順（payload → trade-event → quote-event → 接続・購読応答）に判定する
+        # 🔹 Public チャンネル（kline, depth, trades）
+        if message_type == "payload":
+            channel_name = data.get("channel", "")
+            try:
+                event_data = data["content"]["data"]
+            except (KeyError, TypeError):  # content が無い / null の場合
+                event_data = None
+
+            # チャンネル名で分類
+            category = self.classify_channel(channel_name)
+
+            if debug:
+                logger.debug("📢 %s: %s", category, data)
+
+            # ✅ オーダーブックの更新（コールバックから最新の板を参照できるよう先に反映）
+            if self._depth_book is not None and category == "depth" and event_data:
+                self._update_books(event_data)
+
+            # ✅ コールバック関数の実行（もし登録されていれば）
+            callback = self.channel_callbacks.get(category)
+            if callback is not None:
+                await self._run_callback(callback, event_data, self._offload_channel_callbacks.get(category) is callback)
+
+            # ✅ メモリ保存（quote-event は除外）
+            if self.save_memory and category in self.memory["public"]:
+                self.store_data("public", category, event_data)
 
         # 🔹 Private チャンネル処理
         elif message_type == "trade-event":
-            event_type = data.get("content", {}).get("event", "")
-            event_data = data.get("content", {}).get("data", None)
+            try:
+                content = data["content"]
+                event_type = content.get("event", "")
+                event_data = content.get("data")
+            except (KeyError, AttributeError):  # content が無い / null の場合
+                event_type, event_data = "", None
 
             if event_type == "Snapshot":
-                print(f"📸 スナップショット（保存しない）: {data}")
+                if debug:
+                    logger.debug("📸 スナップショット（保存しない）: %s", data)
                 return  # スナップショットは保存しない
 
-            print(f"📢 {event_type}: {data}")
+            if debug:
+                logger.debug("📢 %s: %s", event_type, data)
 
             # ✅ コールバック関数の実行（もし登録されていれば）
-            if event_type in self.event_callbacks:
-                await self.event_callbacks[event_type](event_data)
+            callback = self.event_callbacks.get(event_type)
+            if callback is not None:
+                await self._run_callback(callback, event_data, self._offload_event_callbacks.get(event_type) is callback)
 
             # ✅ メモリ保存（quote-event は除外）
             if self.save_memory:
@@ -932,46 +1586,131 @@ class EdgeXAPIClient:
 
         # 🔹 Quote チャンネル（特別扱い: メモリ保存しない）
         elif message_type == 'quote-event':
-            print(f"📢 Quote: {data}")
+            if debug:
+                logger.debug("📢 Quote: %s", data)
 
             # ✅ コールバック関数の実行（もし登録されていれば）
-            if 'quote' in self.channel_callbacks:
-                await self.channel_callbacks['quote'](data)
+            callback = self.channel_callbacks.get('quote')
+            if callback is not None:
+                await self._run_callback(callback, data, self._offload_channel_callbacks.get('quote') is callback)
 
-        # 🔹 Public チャンネル（kline, depth, trades）
-        elif message_type == "payload":
-            channel_name = data.get("channel", "")
-            event_data = data.get("content", {}).get("data", None)
-
-            # 正規表現で分類
-            category = self.classify_channel(channel_name)
-
-            print(f"📢 {category}: {data}")
-
-            # ✅ コールバック関数の実行（もし登録されていれば）
-            if category in self.channel_callbacks:
-                await self.channel_callbacks[category](event_data)
-
-            # ✅ メモリ保存（quote-event は除外）
-            if self.save_memory and category in self.memory["public"]:
-                self.store_data("public", category, event_data)
+        # 🔹 接続・購読の応答
+        elif message_type in ('connected', 'subscribed'):
+            logger.info("👤 接続処理: %s", data)
 
         else:
-            print(f"🔍 未知のメッセージタイプ: {message_type}")
+            if debug:
+                logger.debug("🔍 未知のメッセージタイプ: %s", message_type)
 
     def classify_channel(self, channel_name):
-        """ 正規表現を使ってチャンネルを分類 """
-        if re.search(r'kline', channel_name, re.IGNORECASE):
-            return "kline"
-        elif re.search(r'depth', channel_name, re.IGNORECASE):
-            return "depth"
-        elif re.search(r'trades?', channel_name, re.IGNORECASE):  # trade または trades
-            return "trades"
+        """ チャンネル名に含まれるキーワードで分類（大文字小文字は区別しない） """
+        # チャンネル名は購読した数だけしか現れないため、分類結果を辞書に保持して次回以降は1回の辞書引きで返す
+        category = self._channel_categories.get(channel_name)
+        if category is not None:
+            return category
+
+        name = channel_name.lower()
+        if "kline" in name:
+            category = "kline"
+        elif "depth" in name:
+            category = "depth"
+        elif "trade" in name:  # trade または trades
+            category = "trades"
         else:
-            return "unknown"
+            category = "unknown"
+
+        if len(self._channel_categories) < 1024:  # 想定外に多くのチャンネル名が来ても肥大化させない
+            self._channel_categories[channel_name] = category
+        return category
 
     def store_data(self, category, event, data):
         """ メモリにデータを保存（キュー形式で最大保存数を超えたら古いものを削除） """
         if data is not None:
-            self.memory[category][event].appendleft(data)  # 新しいデータをリストの先頭（index=0）に追加
-            print(f"💾 データ保存: {event} ({len(self.memory[category][event])}/{self.max_memory})")
\ No newline at end of file
+            if category == "public" and event in self.ring:
+                self._store_ring(event, data)
+                return
+            self.memory[category][event].append(data)  # 新しいデータを末尾（index=-1）に追加
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("💾 データ保存: %s (%d/%d)", event, len(self.memory[category][event]), self.max_memory)
+
+    def _store_ring(self, event, data):
+        """ kline / trades の受信データを行に変換してリングバッファに追加（途中で失敗した場合は 1 行も追加しない） """
+        try:
+            rows = list(self._ring_rows[event](data))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("⚠️ リングバッファに保存できないデータ: %s", event)
+            return
+        self.ring[event].extend(rows)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("💾 データ保存: %s (%d/%d)", event, len(self.ring[event]), self.max_memory)
+
+    def _update_books(self, event_data):
+        """ depth チャンネルの受信データを契約ごとの DepthBook に反映 """
+        for depth in event_data:
+            try:
+                contract_id = depth["contractId"]
+                book = self.books.get(contract_id)
+                if book is None:
+                    book = self.books[contract_id] = self._depth_book()
+                book.apply(depth)
+            except (KeyError, TypeError, ValueError):
+                logger.warning("⚠️ オーダーブックに反映できないデータ: %s", depth)
+
+
+class AsyncEdgeXAPIClient(EdgeXAPIClient):
+    """
+    REST API を非同期で呼び出す EdgeX API クライアント（httpx が必要）
+    各 API メソッド（get_ticker など）はコルーチンを返すため await して使う。
+    HTTP/2 の1本の接続上で多重化されるため、asyncio.gather で複数のAPIを同時に呼び出せる。
+
+    例:
+        async with AsyncEdgeXAPIClient() as client:
+            tickers = await asyncio.gather(*(client.get_ticker(c) for c in contract_ids))
+    """
+    __slots__ = ()
+
+    send_api_request = EdgeXAPIClient.send_api_request_async
+
+    def _post_direct(self, endpoint: str, data: dict):
+        # 注文・取消もイベントループを止めないよう httpx で送信する（コルーチンを返す）
+        return self.send_api_request("POST", endpoint, data=data)
+
+    async def send_many(self, requests_list, auth_required: bool = True):
+        """ 複数のリクエストを並行して送信（引数・戻り値は EdgeXAPIClient.send_many と同じ） """
+        return await asyncio.gather(*(
+            self.send_api_request(http_method, endpoint, query_params, rest[0] if rest else None,
+                                  auth_required=auth_required)
+            for http_method, endpoint, query_params, *rest in requests_list
+        ))
+
+    async def run_batch(self, calls):
+        """ 複数の API メソッドを並行して呼び出す（引数・戻り値は EdgeXAPIClient.run_batch と同じ） """
+        return await asyncio.gather(*(getattr(self, method_name)(**kwargs) for method_name, kwargs in calls))
+
+    def run_batch_sync(self, calls):
+        """ run_batch の同期版。httpx のクライアントは asyncio.run のイベントループに紐づくため、終了時に閉じる """
+        async def run():
+            try:
+                return await self.run_batch(calls)
+            finally:
+                await self.aclose()
+        return asyncio.run(run())
+
+    async def iter_page_items(self, method_name: str, **kwargs):
+        """ EdgeXAPIClient.iter_page_items の非同期ジェネレーター版（async for で使う） """
+        method = getattr(self, method_name)
+        while True:
+            response = await method(**kwargs)
+            page = _page_data(method_name, response)
+            for item in page.get("dataList") or ():
+                yield item
+            kwargs["offset_data"] = page.get("nextPageOffsetData")
+            if not kwargs["offset_data"]:
+                return
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        await self.aclose()
+        self.close()
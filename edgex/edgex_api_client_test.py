@@ -0,0 +1,122 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from edgex.edgex_api_client import EdgeXAPIClient
+from starkware.crypto.signature.signature import private_key_to_ec_point_on_stark_curve, verify
+from starkware.crypto.signature.signature import sign as starkware_sign
+
+# 署名キー・ハッシュは固定値（どちらの実装も RFC6979 の決定的な k を使うため、同じ (r, s) になる）
+PRIVATE_KEY = 0x3c1e9550e66958296d11b60f8e8e7a7ad990d07fa65d5f7652c4a6c87d4e3cc
+MSG_HASH = 0x397e76d1667c4454bfb83514e120583af836f8e32a516765497823eabe16a3f
+
+
+def test_native_sign_matches_starkware():
+    # fast_stark_crypto が無い環境では edgex の sign は starkware の実装そのものになるためスキップする
+    pytest.importorskip("fast_stark_crypto")
+    from edgex.edgex_api_client import sign
+
+    r, s = sign(MSG_HASH, PRIVATE_KEY)
+    assert (r, s) == starkware_sign(msg_hash=MSG_HASH, priv_key=PRIVATE_KEY)
+    public_key = private_key_to_ec_point_on_stark_curve(PRIVATE_KEY)
+    assert verify(MSG_HASH, r, s, public_key)
+
+
+@pytest.fixture
+def server():
+    """ 最初のリクエストに 503、以降は 200 を返すローカルサーバー（受信したリクエストを hits に記録） """
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _respond(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            hits.append((self.command, self.headers.get("X-edgeX-Api-Signature")))
+            code = 503 if len(hits) == 1 else 200
+            body = json.dumps({"code": "SUCCESS" if code == 200 else "ERR"}).encode()
+            self.send_response(code)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = _respond
+
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = EdgeXAPIClient(private_key_hex=hex(PRIVATE_KEY), account_id="1")
+    client.base_url = server[0]
+    # テスト用サーバーは http のため、https 用のアダプター（リトライ設定）をそのまま使う
+    client._session.mount("http://", client._session.get_adapter("https://"))
+    yield client
+    client.close()
+
+
+def test_get_503_is_retried_with_same_signature(server, client):
+    _, hits = server
+    assert client.send_api_request("GET", "/api/v1/private/x", {"a": "1"}) == {"code": "SUCCESS"}
+    assert [method for method, _ in hits] == ["GET", "GET"]
+    assert hits[0][1] is not None and hits[0][1] == hits[1][1]
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_post_503_is_not_retried(server, client, direct):
+    _, hits = server
+    if direct:
+        response = client.cancel_all_order("1")
+    else:
+        response = client.send_api_request("POST", "/api/v1/private/x", data={"a": 1})
+    assert response == {"code": "ERR"}
+    assert [method for method, _ in hits] == ["POST"]
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """ 送信せずに、署名対象のクエリ文字列と送信する URL を記録するクライアント """
+    client = EdgeXAPIClient(private_key_hex=hex(PRIVATE_KEY), account_id="1")
+    record = {}
+    generate_signature_headers = EdgeXAPIClient.generate_signature_headers
+
+    def signature_headers(self, http_method, request_path, query_params, sorted_query=None):
+        record["signed"] = sorted_query
+        return generate_signature_headers(self, http_method, request_path, query_params, sorted_query)
+
+    class Response:
+        status_code = 200
+        content = b'{"code": "SUCCESS"}'
+
+    def request(http_method, url, **kwargs):
+        record["url"] = url
+        return Response()
+
+    # __slots__ のためインスタンスではなくクラスの属性を差し替える
+    monkeypatch.setattr(EdgeXAPIClient, "generate_signature_headers", signature_headers)
+    monkeypatch.setattr(client._session, "request", request)
+    yield client, record
+    client.close()
+
+
+def test_sent_query_matches_signed_query(captured):
+    client, record = captured
+    client.send_api_request("GET", "/api/v1/private/x", {"c": "x", "a": "A B&C", "b": 2})
+    assert record["signed"] == "a=A B&C&b=2&c=x"
+    # 送信するクエリは署名と同じキー順で、値だけを quote_plus でエンコードしたもの
+    assert record["url"].split("?", 1)[1] == "a=A+B%26C&b=2&c=x"
+
+
+def test_none_params_are_left_out_of_signature_and_url(captured):
+    client, record = captured
+    client.send_api_request("GET", "/api/v1/private/x", {"b": None, "a": "1", "c": None})
+    assert record["signed"] == "a=1"
+    assert record["url"].split("?", 1)[1] == "a=1"
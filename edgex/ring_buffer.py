@@ -0,0 +1,68 @@
+"""
+Public チャンネル（kline / trades）用の NumPy 構造化配列リングバッファ
+
+辞書の deque と比べて 1 件あたりのメモリが小さく、保存済みデータをそのまま NumPy で集計できる。
+numpy が必要（EdgeXAPIClient(ring_memory=True) の場合のみ import される）。
+"""
+import numpy as np
+
+# kline: 足の開始時刻（ミリ秒）と OHLCV
+KLINE_DTYPE = np.dtype([("t", "i8"), ("o", "f8"), ("h", "f8"), ("l", "f8"), ("c", "f8"), ("v", "f8")])
+# trades: 約定時刻（ミリ秒）、価格、数量、買い手がメイカーか
+TRADE_DTYPE = np.dtype([("t", "i8"), ("p", "f8"), ("q", "f8"), ("buyer_maker", "?")])
+
+
+class RingBuffer:
+    """ 固定長の構造化配列に先頭インデックスを持たせた循環バッファ（上限を超えると最古の行から上書き） """
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"RingBuffer capacity must be at least 1: {capacity}")
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self._capacity = capacity
+        self._count = 0  # これまでに書き込んだ総行数
+
+    def __len__(self):
+        return min(self._count, self._capacity)
+
+    def append(self, row: tuple):
+        """ 1 行追加（row は dtype のフィールド順のタプル） """
+        self._buf[self._count % self._capacity] = row
+        self._count += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def to_array(self) -> np.ndarray:
+        """ 古い順に並べた配列を返す（一周する前はコピーなしのビュー） """
+        if self._count <= self._capacity:
+            return self._buf[:self._count]
+        head = self._count % self._capacity
+        return np.concatenate((self._buf[head:], self._buf[:head]))
+
+    def latest(self):
+        """ 最新の 1 行のコピー（無ければ None。ビューを返すと上書き時に値が変わってしまうため） """
+        if self._count == 0:
+            return None
+        return self._buf[(self._count - 1) % self._capacity].copy()
+
+
+def kline_rows(event_data):
+    """ kline の content.data（list[dict]）を KLINE_DTYPE の行に変換 """
+    for k in event_data:
+        yield (int(k["klineTime"]), float(k["open"]), float(k["high"]), float(k["low"]),
+               float(k["close"]), float(k["size"]))
+
+
+def trade_rows(event_data):
+    """ trades の content.data（list[dict]）を TRADE_DTYPE の行に変換 """
+    for t in event_data:
+        yield int(t["time"]), float(t["price"]), float(t["size"]), bool(t.get("isBuyerMaker", False))
+
+
+# チャンネル分類 → (dtype, 行変換関数)。depth は差分更新のため固定長の行にできず、deque で保存する
+RING_CHANNELS = {
+    "kline": (KLINE_DTYPE, kline_rows),
+    "trades": (TRADE_DTYPE, trade_rows),
+}
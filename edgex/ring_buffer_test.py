@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from edgex.ring_buffer import KLINE_DTYPE, TRADE_DTYPE, RingBuffer, kline_rows, trade_rows  # noqa: E402
+
+
+def trade(t):
+    return t, float(t), 1.0, False
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBuffer(TRADE_DTYPE, 0)
+
+
+def test_to_array_before_wraparound():
+    ring = RingBuffer(TRADE_DTYPE, 4)
+    ring.extend(trade(t) for t in range(3))
+    assert len(ring) == 3
+    assert ring.to_array()["t"].tolist() == [0, 1, 2]
+
+
+def test_to_array_after_wraparound_is_oldest_first():
+    ring = RingBuffer(TRADE_DTYPE, 4)
+    ring.extend(trade(t) for t in range(10))
+    assert len(ring) == 4
+    assert ring.to_array()["t"].tolist() == [6, 7, 8, 9]
+
+
+def test_latest_on_empty_and_full_buffer():
+    ring = RingBuffer(TRADE_DTYPE, 2)
+    assert ring.latest() is None
+    ring.extend(trade(t) for t in range(2))
+    latest = ring.latest()
+    assert latest["t"] == 1
+    # 返した行は後から同じ位置が上書きされても変わらない
+    ring.extend(trade(t) for t in range(2, 4))
+    assert latest["t"] == 1
+    assert ring.latest()["t"] == 3
+
+
+def test_kline_rows():
+    data = [{"klineTime": "1700000000000", "open": "1.5", "high": "2", "low": "1", "close": "1.8",
+             "size": "10"}]
+    ring = RingBuffer(KLINE_DTYPE, 2)
+    ring.extend(kline_rows(data))
+    assert ring.to_array().tolist() == [(1700000000000, 1.5, 2.0, 1.0, 1.8, 10.0)]
+
+
+def test_trade_rows():
+    data = [{"time": "1700000000001", "price": "100.5", "size": "0.2", "isBuyerMaker": True},
+            {"time": "1700000000002", "price": "101", "size": "1"}]
+    assert list(trade_rows(data)) == [(1700000000001, 100.5, 0.2, True), (1700000000002, 101.0, 1.0, False)]
@@ -1,7 +1,15 @@
-from edgex.edgex_api_client import EdgeXAPIClient
+from edgex.edgex_api_client import EdgeXAPIClient, setup_queue_logging
 import asyncio
+import logging
 import websockets
 
+try:
+    # uvloop があればイベントループを差し替える（WebSocket受信ループのスループット向上）
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 def main():
     client = EdgeXAPIClient()  # secrets/secret.json からデフォルト値がロードされる
 
@@ -12,16 +20,13 @@ def main():
     # print(ticket)
 
     # private_API
-    # response = client.get_account_position_transaction_page(
+    # 戻り値はデコード済みの JSON（dict）
+    # response = client.get_position_transaction_page(
     #     account_id=client.account_id,
     #     filter_type_list="SETTLE_FUNDING_FEE",
     #     size="20"  # 例として size を 20 に変更
     # )
-    # print("Status Code:", response.status_code)
-    # try:
-    #     print("Response:", response.json())
-    # except Exception as e:
-    #     print("Response (Raw):", response.text)
+    # print("Response:", response)
 
     # Postメソッドのテスト
     # cancelRes = client.cancel_all_order(client.account_id)
@@ -53,7 +58,13 @@ def main():
     # メモリデータの取得・表示
     # print("\n📌 PRIVATE DATA")
     # for event, data_queue in client.memory["private"].items():
-    #     print(f"🔸 {event} ({len(data_queue)}件): {list(data_queue)[:3]}...")  # 最新3件のみ表示
+    #     print(f"🔸 {event} ({len(data_queue)}件): {list(data_queue)[-3:]}...")  # 最新3件のみ表示（末尾が最新）
 
 if __name__ == "__main__":
-    main()
+    # クライアントのログは logging で出力される（詳細な署名・受信ログは level=logging.DEBUG で表示）
+    # 出力は別スレッドで行い、受信ループを止めない
+    listener = setup_queue_logging(logging.INFO)
+    try:
+        main()
+    finally:
+        listener.stop()
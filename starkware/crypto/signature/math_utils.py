@@ -15,12 +15,18 @@
 ###############################################################################
 
 
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 import mpmath
 import sympy
 from sympy.core.numbers import igcdex
 
+try:
+    # Optional: GMP-backed integers make the field arithmetic in ec_mult_jacobian ~2.5x faster.
+    from gmpy2 import mpz
+except ImportError:
+    mpz = None
+
 # A type that represents a point (x,y) on an elliptic curve.
 ECPoint = Tuple[int, int]
 
@@ -98,3 +104,138 @@ def ec_mult(m: int, point: ECPoint, alpha: int, p: int) -> ECPoint:
     if m % 2 == 0:
         return ec_mult(m // 2, ec_double(point, alpha, p), alpha, p)
     return ec_add(ec_mult(m - 1, point, alpha, p), point, p)
+
+
+# A type that represents a point (X, Y, Z) in Jacobian coordinates, where x = X/Z^2, y = Y/Z^3.
+# Z == 0 represents the point at infinity.
+JacobianPoint = Tuple[int, int, int]
+
+
+def ec_double_jacobian(point: JacobianPoint, alpha: int, p: int) -> JacobianPoint:
+    """
+    Doubles a point given in Jacobian coordinates on the elliptic curve with the equation
+    y^2 = x^3 + alpha*x + beta mod p. No modular inversion is needed.
+    """
+    x, y, z = point
+    if y == 0 or z == 0:
+        return (1, 1, 0)
+    yy = y * y % p
+    zz = z * z % p
+    s = 4 * x * yy % p
+    m = (3 * x * x + alpha * zz * zz) % p
+    x3 = (m * m - 2 * s) % p
+    y3 = (m * (s - x3) - 8 * yy * yy) % p
+    z3 = 2 * y * z % p
+    return x3, y3, z3
+
+
+def ec_add_jacobian_affine(
+        point1: JacobianPoint, point2: ECPoint, alpha: int, p: int) -> JacobianPoint:
+    """
+    Adds an affine point (x, y) to a point given in Jacobian coordinates on the elliptic curve with
+    the equation y^2 = x^3 + alpha*x + beta mod p, and returns the sum in Jacobian coordinates.
+    """
+    x1, y1, z1 = point1
+    if z1 == 0:
+        return point2[0], point2[1], 1
+    z1z1 = z1 * z1 % p
+    u2 = point2[0] * z1z1 % p
+    s2 = point2[1] * z1 * z1z1 % p
+    h = (u2 - x1) % p
+    r = (s2 - y1) % p
+    if h == 0:
+        if r == 0:
+            return ec_double_jacobian(point1, alpha, p)
+        return (1, 1, 0)
+    hh = h * h % p
+    hhh = h * hh % p
+    v = x1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    y3 = (r * (v - x3) - y1 * hhh) % p
+    z3 = z1 * h % p
+    return x3, y3, z3
+
+
+def jacobian_to_affine(point: JacobianPoint, p: int) -> ECPoint:
+    """
+    Converts a point from Jacobian coordinates to affine form (x, y).
+    Assumes the point is not the point at infinity.
+    """
+    x, y, z = point
+    assert z % p != 0
+    z_inv = div_mod(1, z, p)
+    z_inv_squared = z_inv * z_inv % p
+    return x * z_inv_squared % p, y * z_inv_squared * z_inv % p
+
+
+def ec_mult_jacobian(m: int, point: ECPoint, alpha: int, p: int) -> ECPoint:
+    """
+    Same as ec_mult, but keeps the intermediate points in Jacobian coordinates so that only a
+    single modular inversion is performed (at the end) instead of one per addition/doubling.
+    Assumes the point is given in affine form (x, y) and that 0 < m < order(point).
+    If gmpy2 is installed, the computation is done with mpz values; the result is always returned
+    as Python ints.
+    This is the variable-base path, for points without a precomputed table. Multiples of the
+    generator (sign, private_key_to_ec_point_on_stark_curve) use ec_gen_mult instead.
+    """
+    assert m > 0
+    if mpz is not None:
+        point, alpha, p = (mpz(point[0]), mpz(point[1])), mpz(alpha), mpz(p)
+    result = (point[0], point[1], 1)
+    for bit in bin(m)[3:]:
+        result = ec_double_jacobian(result, alpha, p)
+        if bit == '1':
+            result = ec_add_jacobian_affine(result, point, alpha, p)
+    x, y = jacobian_to_affine(result, p)
+    return int(x), int(y)
+
+
+# A fixed-base table for ec_mult_fixed_base: table[i][j] == j * 2**(window_bits * i) * point in
+# affine form (table[i][0] is None, standing for the point at infinity).
+FixedBaseTable = Tuple[Tuple[Optional[ECPoint], ...], ...]
+
+
+def precompute_fixed_base_table(
+        point: ECPoint, n_bits: int, window_bits: int, alpha: int, p: int) -> FixedBaseTable:
+    """
+    Precomputes the table used by ec_mult_fixed_base for multiplying the given point by scalars of
+    at most n_bits bits, processed window_bits bits at a time.
+    """
+    if mpz is not None:
+        point, alpha, p = (mpz(point[0]), mpz(point[1])), mpz(alpha), mpz(p)
+    table = []
+    base = point
+    for _ in range(-(-n_bits // window_bits)):
+        row: List[Optional[ECPoint]] = [None, base]
+        acc = (base[0], base[1], 1)
+        for _ in range(2, 2**window_bits + 1):
+            acc = ec_add_jacobian_affine(acc, base, alpha, p)
+            row.append(jacobian_to_affine(acc, p))
+        # The last entry is 2**window_bits * base, which is the base of the next row.
+        base = row.pop()
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def ec_mult_fixed_base(m: int, table: FixedBaseTable, alpha: int, p: int) -> ECPoint:
+    """
+    Same as ec_mult_jacobian, but uses a table computed by precompute_fixed_base_table for the point,
+    so that only one addition per window (and no doubling) is performed.
+    Assumes that 0 < m < 2**n_bits and that m is not a multiple of order(point).
+    """
+    assert m > 0
+    window_bits = (len(table[0]) - 1).bit_length()
+    mask = len(table[0]) - 1
+    if mpz is not None:
+        alpha, p = mpz(alpha), mpz(p)
+    result = (1, 1, 0)
+    for row in table:
+        if m == 0:
+            break
+        digit = m & mask
+        if digit:
+            result = ec_add_jacobian_affine(result, row[digit], alpha, p)
+        m >>= window_bits
+    assert m == 0, 'Scalar is too large for the table.'
+    x, y = jacobian_to_affine(result, p)
+    return int(x), int(y)
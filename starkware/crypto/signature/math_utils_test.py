@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from starkware.crypto.signature import ALPHA, EC_GEN, EC_ORDER, FIELD_PRIME
+
+from . import math_utils
+from .math_utils import (
+    ec_mult, ec_mult_fixed_base, ec_mult_jacobian, precompute_fixed_base_table)
+from .signature import ec_gen_mult
+
+
+@pytest.mark.parametrize('m', [1, 2, 3, 4, 5, 255, 256, EC_ORDER - 2, EC_ORDER - 1])
+def test_ec_mult_jacobian_edge_scalars(m):
+    assert ec_mult_jacobian(m, EC_GEN, ALPHA, FIELD_PRIME) == \
+        tuple(ec_mult(m, EC_GEN, ALPHA, FIELD_PRIME))
+
+
+def test_ec_mult_jacobian_random():
+    m = random.randint(1, EC_ORDER - 1)
+    assert ec_mult_jacobian(m, EC_GEN, ALPHA, FIELD_PRIME) == \
+        tuple(ec_mult(m, EC_GEN, ALPHA, FIELD_PRIME))
+
+
+@pytest.mark.parametrize('use_gmpy2', [False, True])
+def test_ec_mult_jacobian_returns_ints(monkeypatch, use_gmpy2):
+    if use_gmpy2:
+        pytest.importorskip('gmpy2')
+    else:
+        monkeypatch.setattr(math_utils, 'mpz', None)
+    m = random.randint(1, EC_ORDER - 1)
+    result = ec_mult_jacobian(m, EC_GEN, ALPHA, FIELD_PRIME)
+    assert all(type(coordinate) is int for coordinate in result)
+    assert result == tuple(ec_mult(m, EC_GEN, ALPHA, FIELD_PRIME))
+
+
+@pytest.mark.parametrize('m', [1, 2, 15, 16, 17, 2**128, EC_ORDER - 1])
+def test_ec_gen_mult_edge_scalars(m):
+    assert ec_gen_mult(m) == tuple(ec_mult(m, EC_GEN, ALPHA, FIELD_PRIME))
+
+
+def test_ec_gen_mult_random():
+    m = random.randint(1, EC_ORDER - 1)
+    assert ec_gen_mult(m) == ec_mult_jacobian(m, EC_GEN, ALPHA, FIELD_PRIME)
+
+
+@pytest.mark.parametrize('window_bits', [1, 3, 5])
+def test_ec_mult_fixed_base_window_sizes(window_bits):
+    table = precompute_fixed_base_table(EC_GEN, 16, window_bits, ALPHA, FIELD_PRIME)
+    for m in [1, 2**16 - 1, random.randint(1, 2**16 - 1)]:
+        assert ec_mult_fixed_base(m, table, ALPHA, FIELD_PRIME) == \
+            tuple(ec_mult(m, EC_GEN, ALPHA, FIELD_PRIME))
+    with pytest.raises(AssertionError):
+        ec_mult_fixed_base(2**(len(table) * window_bits), table, ALPHA, FIELD_PRIME)
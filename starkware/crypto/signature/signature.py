@@ -14,6 +14,7 @@
 # and limitations under the License.                                          #
 ###############################################################################
 
+import functools
 import hashlib
 import json
 import math
@@ -23,7 +24,9 @@ from typing import Optional, Tuple, Union
 
 from ecdsa.rfc6979 import generate_k
 
-from .math_utils import ECPoint, div_mod, ec_add, ec_double, ec_mult, is_quad_residue, sqrt_mod
+from .math_utils import (
+    ECPoint, FixedBaseTable, div_mod, ec_add, ec_double, ec_mult_fixed_base, is_quad_residue,
+    precompute_fixed_base_table, sqrt_mod)
 
 PEDERSEN_HASH_POINT_FILENAME = os.path.join(
     os.path.dirname(__file__), 'pedersen_params.json')
@@ -53,6 +56,8 @@ assert SHIFT_POINT == [0x49ee3eba8c1600700ee1b87eb599f16716b0b1022947733551fde40
                        0x3ca0cfe4b3bc6ddf346d49d06ea0ed34e621062c0e056c1d0405d266e10268a]
 assert EC_GEN == [0x1ef15c18599971b7beced415a40f0c7deacfd9b0d1819e03d723d8bc943cfca,
                   0x5668060aa49730b7be4801df46ec62de53ecd11abe43a32873000c36e8dc1f]
+# Multiples of EC_GEN are computed with a precomputed table, see ec_gen_table().
+EC_GEN_WINDOW_BITS = 4
 
 
 #########
@@ -88,9 +93,26 @@ def get_random_private_key() -> int:
     return random.randint(1, EC_ORDER - 1)
 
 
+@functools.lru_cache(maxsize=None)
+def ec_gen_table() -> FixedBaseTable:
+    """
+    The fixed-base table of EC_GEN (4-bit windows covering scalars below EC_ORDER).
+    Computed on first use, and then kept for the lifetime of the process.
+    """
+    return precompute_fixed_base_table(
+        EC_GEN, EC_ORDER.bit_length(), EC_GEN_WINDOW_BITS, ALPHA, FIELD_PRIME)
+
+
+def ec_gen_mult(m: int) -> ECPoint:
+    """
+    Returns m * EC_GEN, for 0 < m < EC_ORDER.
+    """
+    return ec_mult_fixed_base(m, ec_gen_table(), ALPHA, FIELD_PRIME)
+
+
 def private_key_to_ec_point_on_stark_curve(priv_key: int) -> ECPoint:
     assert 0 < priv_key < EC_ORDER
-    return ec_mult(priv_key, EC_GEN, ALPHA, FIELD_PRIME)
+    return ec_gen_mult(priv_key)
 
 
 def private_to_stark_key(priv_key: int) -> int:
@@ -135,7 +157,7 @@ def sign(msg_hash: int, priv_key: int, seed: Optional[int] = None) -> ECSignatur
             seed += 1
 
         # Cannot fail because 0 < k < EC_ORDER and EC_ORDER is prime.
-        x = ec_mult(k, EC_GEN, ALPHA, FIELD_PRIME)[0]
+        x = ec_gen_mult(k)[0]
 
         # DIFF: in classic ECDSA, we take int(x) % n.
         r = int(x)